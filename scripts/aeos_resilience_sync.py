@@ -2,17 +2,26 @@
 from __future__ import annotations
 
 import hashlib
+import os
 import re
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Iterator
 
 ROOT = Path(__file__).resolve().parents[1]
 AEOS = ROOT / "AEOS_Memory"
 DB_PATH = AEOS / "Operational_Memory" / "aeos_resilience.sqlite"
 
+HEADER_TS_RE = re.compile(r"\(([^)]+)\)")
+LOG_LINE_TS_RE = re.compile(r"-\s*(\d{4}-\d{2}-\d{2})")
+TIMESTAMP_FIELD_RE = re.compile(r"^\- Timestamp:\s*(.+)$", re.MULTILINE)
+WHITESPACE_RE = re.compile(r"\s+")
+
 
 def sha(value: str) -> str:
+    # Persisted as the UNIQUE dedup key; changing the algorithm re-ingests every row.
     return hashlib.sha256(value.encode("utf-8")).hexdigest()
 
 
@@ -48,7 +57,7 @@ def ensure_schema(conn: sqlite3.Connection) -> None:
             path TEXT PRIMARY KEY,
             mtime TEXT NOT NULL,
             size INTEGER NOT NULL
-        )
+        ) WITHOUT ROWID
         """
     )
     conn.execute(
@@ -62,17 +71,27 @@ def ensure_schema(conn: sqlite3.Connection) -> None:
     )
 
 
+def iter_h2_sections(text: str) -> Iterator[str]:
+    # Yields the same sections as splitting on "\n## " and re-adding the "## "
+    # prefix, without building the full list of parts up front.
+    start = 0
+    while True:
+        end = text.find("\n## ", start)
+        if end < 0:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
+
+
 def ingest_checkpoints(conn: sqlite3.Connection) -> int:
     state_file = AEOS / "Operational_Memory" / "current-state.md"
     if not state_file.exists():
         return 0
 
     text = state_file.read_text(encoding="utf-8")
-    # Split by markdown H2 sections
-    parts = re.split(r"\n## ", text)
-    inserted = 0
-    for i, raw in enumerate(parts):
-        section = raw if i == 0 else f"## {raw}"
+    rows: list[tuple[str | None, str, str, str, str]] = []
+    for section in iter_h2_sections(text):
         lines = section.splitlines()
         if not lines:
             continue
@@ -80,18 +99,19 @@ def ingest_checkpoints(conn: sqlite3.Connection) -> int:
         if not header.startswith("## Operational Checkpoint"):
             continue
         body = "\n".join(lines[1:]).strip()
-        ts_match = re.search(r"\(([^)]+)\)", header)
+        ts_match = HEADER_TS_RE.search(header)
         ts = ts_match.group(1).strip() if ts_match else None
         h = sha(f"{state_file}|{header}|{body}")
-        cur = conn.execute(
-            """
-            INSERT OR IGNORE INTO checkpoints (timestamp, title, source_file, body, hash)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (ts, header.replace("## ", "", 1), str(state_file), body, h),
-        )
-        inserted += cur.rowcount
-    return inserted
+        rows.append((ts, header.replace("## ", "", 1), str(state_file), body, h))
+
+    cur = conn.executemany(
+        """
+        INSERT OR IGNORE INTO checkpoints (timestamp, title, source_file, body, hash)
+        VALUES (?, ?, ?, ?, ?)
+        """,
+        rows,
+    )
+    return cur.rowcount
 
 
 def ingest_decisions(conn: sqlite3.Connection) -> int:
@@ -99,77 +119,105 @@ def ingest_decisions(conn: sqlite3.Connection) -> int:
     if not decisions_dir.exists():
         return 0
 
-    inserted = 0
+    rows: list[tuple[str | None, str, str, str]] = []
     for file in sorted(decisions_dir.glob("*.md")):
         text = file.read_text(encoding="utf-8")
 
+        source_file = str(file)
+
         if file.name == "weekly-learning-log.md":
+            # Same digest as sha(f"{file}|{line}"), without re-hashing the path per line.
+            prefix = hashlib.sha256(f"{source_file}|".encode("utf-8"))
             for line in text.splitlines():
                 line = line.strip()
                 if not line.startswith("- "):
                     continue
-                ts_match = re.match(r"-\s*(\d{4}-\d{2}-\d{2})", line)
+                ts_match = LOG_LINE_TS_RE.match(line)
                 ts = ts_match.group(1) if ts_match else None
-                h = sha(f"{file}|{line}")
-                cur = conn.execute(
-                    """
-                    INSERT OR IGNORE INTO decisions (timestamp, source_file, summary, hash)
-                    VALUES (?, ?, ?, ?)
-                    """,
-                    (ts, str(file), line[2:].strip(), h),
-                )
-                inserted += cur.rowcount
+                digest = prefix.copy()
+                digest.update(line.encode("utf-8"))
+                rows.append((ts, source_file, line[2:].strip(), digest.hexdigest()))
             continue
 
-        ts_match = re.search(r"^\- Timestamp:\s*(.+)$", text, flags=re.MULTILINE)
+        ts_match = TIMESTAMP_FIELD_RE.search(text)
         ts = ts_match.group(1).strip() if ts_match else None
-        summary = re.sub(r"\s+", " ", text.strip())[:4000]
-        h = sha(f"{file}|{summary}")
-        cur = conn.execute(
-            """
-            INSERT OR IGNORE INTO decisions (timestamp, source_file, summary, hash)
-            VALUES (?, ?, ?, ?)
-            """,
-            (ts, str(file), summary, h),
-        )
-        inserted += cur.rowcount
+        summary = WHITESPACE_RE.sub(" ", text.strip())[:4000]
+        rows.append((ts, source_file, summary, sha(f"{source_file}|{summary}")))
 
-    return inserted
-
-
-def refresh_artifacts(conn: sqlite3.Connection) -> int:
-    changed = 0
-    for path in AEOS.rglob("*"):
-        if not path.is_file() or path == DB_PATH:
+    cur = conn.executemany(
+        """
+        INSERT OR IGNORE INTO decisions (timestamp, source_file, summary, hash)
+        VALUES (?, ?, ?, ?)
+        """,
+        rows,
+    )
+    return cur.rowcount
+
+
+def iter_files(root: Path) -> Iterator[os.DirEntry[str]]:
+    # os.scandir reuses the directory listing's file type, so only regular
+    # files cost a stat() call (rglob + is_file + stat paid two per entry).
+    stack = [str(root)]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    yield entry
+
+
+def scan_artifacts() -> list[tuple[str, str, int]]:
+    db_path = str(DB_PATH)
+    scanned: list[tuple[str, str, int]] = []
+    for entry in iter_files(AEOS):
+        # Skip the database and its -journal sidecar, which change on every run.
+        if entry.path.startswith(db_path):
             continue
-        stat = path.stat()
+        stat = entry.stat()
         mtime = datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc).isoformat()
-        cur = conn.execute(
-            """
-            INSERT INTO artifacts(path, mtime, size)
-            VALUES (?, ?, ?)
-            ON CONFLICT(path) DO UPDATE SET mtime=excluded.mtime, size=excluded.size
-            """,
-            (str(path), mtime, stat.st_size),
-        )
-        changed += cur.rowcount
-    return changed
+        scanned.append((entry.path, mtime, stat.st_size))
+    return scanned
+
+
+def refresh_artifacts(conn: sqlite3.Connection, scanned: list[tuple[str, str, int]]) -> int:
+    existing = {
+        path: (mtime, size)
+        for path, mtime, size in conn.execute("SELECT path, mtime, size FROM artifacts")
+    }
+    rows = [row for row in scanned if existing.get(row[0]) != row[1:]]
+    cur = conn.executemany(
+        """
+        INSERT INTO artifacts(path, mtime, size)
+        VALUES (?, ?, ?)
+        ON CONFLICT(path) DO UPDATE SET mtime=excluded.mtime, size=excluded.size
+        """,
+        rows,
+    )
+    return cur.rowcount
 
 
 def main() -> None:
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
     conn = sqlite3.connect(DB_PATH)
     try:
-        ensure_schema(conn)
-        checkpoints = ingest_checkpoints(conn)
-        decisions = ingest_decisions(conn)
-        artifacts = refresh_artifacts(conn)
-        note = f"checkpoints+{checkpoints}; decisions+{decisions}; artifacts_upserted={artifacts}"
-        conn.execute(
-            "INSERT INTO sync_log(synced_at, notes) VALUES (?, ?)",
-            (datetime.now(timezone.utc).isoformat(), note),
-        )
-        conn.commit()
+        # The tree walk is pure filesystem I/O, so it runs on a worker thread
+        # while ingest parses and writes; the connection stays on this thread.
+        with ThreadPoolExecutor(max_workers=1) as ex:
+            scan = ex.submit(scan_artifacts)
+            # One transaction for the whole sync: a single commit, rolled back on error.
+            with conn:
+                ensure_schema(conn)
+                checkpoints = ingest_checkpoints(conn)
+                decisions = ingest_decisions(conn)
+                artifacts = refresh_artifacts(conn, scan.result())
+                note = f"checkpoints+{checkpoints}; decisions+{decisions}; artifacts_upserted={artifacts}"
+                conn.execute(
+                    "INSERT INTO sync_log(synced_at, notes) VALUES (?, ?)",
+                    (datetime.now(timezone.utc).isoformat(), note),
+                )
+        # Refresh planner statistics for the UNIQUE hash lookups when they are stale.
+        conn.execute("PRAGMA optimize")
         print(f"DB: {DB_PATH}")
         print(note)
     finally:
@@ -4,17 +4,18 @@
 from __future__ import annotations
 
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import sys
 
 
-REQUIRED_FILES = [
+REQUIRED_FILES = (
     ".github/prompts/agent-router.prompt.md",
     ".github/prompts/README.md",
     ".github/prompts/agent-team.prompt.md",
-]
+)
 
-ROLE_PROMPTS = [
+ROLE_PROMPTS = (
     ".github/prompts/product-lead.prompt.md",
     ".github/prompts/ux-lead.prompt.md",
     ".github/prompts/frontend-lead.prompt.md",
@@ -30,9 +31,9 @@ ROLE_PROMPTS = [
     ".github/prompts/growth-lead.prompt.md",
     ".github/prompts/support-ops-lead.prompt.md",
     ".github/prompts/release-manager.prompt.md",
-]
+)
 
-ROUTER_REQUIRED_SNIPPETS = [
+ROUTER_REQUIRED_SNIPPETS = (
     "Deterministic Routing Algorithm",
     "Role Task Charters",
     "[Invoking:",
@@ -40,25 +41,34 @@ ROUTER_REQUIRED_SNIPPETS = [
     "Goal -> Plan -> Action -> Observation -> Correction -> Completion",
     "Swarm Collaboration Protocol",
     "[Swarm mode:",
-]
+)
 
-ROLE_REQUIRED_SNIPPETS = [
+ROLE_REQUIRED_SNIPPETS = (
     "Swarm Collaboration:",
     "Dynamic Tool Selection",
     "[Using tools:",
-]
+)
 
-AGENT_DOC_REQUIRED_SNIPPETS = [
+AGENT_DOC_REQUIRED_SNIPPETS = (
     "Auto-Select Routing Contract",
     "Role-to-Skill-and-Tool Matrix",
     "Swarm and Inter-Agent Messaging Rules",
-]
+)
 
 
 def read_text(path: Path) -> str:
     return path.read_text(encoding="utf-8", errors="replace")
 
 
+def check_role_prompt(repo_root: Path, rel: str) -> list[str]:
+    text = read_text(repo_root / rel)
+    return [
+        f"{rel} missing snippet: {snippet}"
+        for snippet in ROLE_REQUIRED_SNIPPETS
+        if snippet not in text
+    ]
+
+
 def find_latest_agent_doc(repo_root: Path) -> Path | None:
     docs_dir = repo_root / "docs" / "agents"
     if not docs_dir.exists():
@@ -77,26 +87,26 @@ def main() -> int:
     repo = Path(args.repo_path).resolve()
     errors: list[str] = []
 
+    missing: set[str] = set()
     for rel in REQUIRED_FILES + ROLE_PROMPTS:
         path = repo / rel
         if not path.exists():
+            missing.add(rel)
             errors.append(f"Missing file: {rel}")
 
-    router_path = repo / ".github/prompts/agent-router.prompt.md"
-    if router_path.exists():
+    router_rel = ".github/prompts/agent-router.prompt.md"
+    router_path = repo / router_rel
+    if router_rel not in missing:
         router_text = read_text(router_path)
         for snippet in ROUTER_REQUIRED_SNIPPETS:
             if snippet not in router_text:
                 errors.append(f"Router missing snippet: {snippet}")
 
-    for rel in ROLE_PROMPTS:
-        path = repo / rel
-        if not path.exists():
-            continue
-        text = read_text(path)
-        for snippet in ROLE_REQUIRED_SNIPPETS:
-            if snippet not in text:
-                errors.append(f"{rel} missing snippet: {snippet}")
+    present_roles = [rel for rel in ROLE_PROMPTS if rel not in missing]
+    # Role prompts are independent; ex.map keeps results in ROLE_PROMPTS order.
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        for role_errors in ex.map(lambda rel: check_role_prompt(repo, rel), present_roles):
+            errors.extend(role_errors)
 
     latest_agent_doc = find_latest_agent_doc(repo)
     if latest_agent_doc is None: